@@ -1,14 +1,45 @@
 import os
+import shutil
+import tempfile
 
 from helpers import *
 
 
 def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "slow: tests that do multiple clones and pushes per run"
+    )
+
     os.environ["GIT_AUTHOR_NAME"] = "Example user"
     os.environ["GIT_AUTHOR_EMAIL"] = "user@example.com"
     os.environ["GIT_COMMITTER_NAME"] = "Example user"
     os.environ["GIT_COMMITTER_EMAIL"] = "user@example.com"
 
+    # All the temporary repositories are throwaway, so there is no point in
+    # putting them on a disk. Prefer a ramdisk if there is one, unless the
+    # caller explicitly chose a location via $TMPDIR (the docker setup does
+    # that and mounts a tmpfs there).
+    if "TMPDIR" not in os.environ and os.access("/dev/shm", os.W_OK):
+        tempfile.tempdir = "/dev/shm"
+
+    # Put everything of this session (or xdist worker) below a single
+    # directory. The cached template repositories in helpers.py live for the
+    # whole session, and this way they (and anything a failed test left
+    # behind) are removed with a single rmtree() at the end.
+    config.grm_arena = tempfile.mkdtemp(prefix="grm-e2e-")
+    tempfile.tempdir = config.grm_arena
+
+    # For the same reason, git does not need to fsync() anything and should
+    # never start a garbage collection in the middle of a test. git before
+    # 2.36 does not know `core.fsync` and just ignores it. Keep anything the
+    # caller already passed this way.
+    os.environ["GIT_CONFIG_PARAMETERS"] = (
+        os.environ.get("GIT_CONFIG_PARAMETERS", "") + " 'core.fsync=none' 'gc.auto=0'"
+    ).strip()
+
+    # Do not let /etc/gitconfig of the machine running the tests interfere.
+    os.environ["GIT_CONFIG_NOSYSTEM"] = "1"
+
 
 def pytest_unconfigure(config):
-    pass
+    shutil.rmtree(config.grm_arena, ignore_errors=True)
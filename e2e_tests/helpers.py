@@ -7,18 +7,44 @@ import tempfile
 import hashlib
 import shutil
 import inspect
+import collections
 
 import git
 
-binary = os.environ["GRM_BINARY"]
+# Resolve the binary once instead of on every invocation. This also makes a
+# relative $GRM_BINARY work with the `cwd` argument of grm().
+binary = os.path.abspath(
+    shutil.which(os.environ["GRM_BINARY"]) or os.environ["GRM_BINARY"]
+)
 
 
 def funcname():
-    return inspect.stack()[1][3]
+    # inspect.stack() would build FrameInfo objects (including source code
+    # context read from disk) for the whole stack, only the caller is needed
+    return inspect.currentframe().f_back.f_code.co_name
 
 
 def copytree(src, dest):
-    shutil.copytree(src, dest, dirs_exist_ok=True)
+    # The object directories of the copied repositories: bare ones have it at
+    # the top, the worktree setup below .git-main-working-tree. Only look at
+    # these, a working tree may contain a directory called "objects" as well.
+    object_dirs = [
+        os.path.join(src, "objects") + os.sep,
+        os.path.join(src, ".git-main-working-tree", "objects") + os.sep,
+    ]
+
+    def copy(src, dest):
+        # Git never changes an object file after writing it, so copies can
+        # share them via hardlinks, the same way `git clone --local` does.
+        if any(src.startswith(object_dir) for object_dir in object_dirs):
+            try:
+                os.link(src, dest)
+                return dest
+            except OSError:
+                pass
+        return shutil.copy2(src, dest)
+
+    shutil.copytree(src, dest, dirs_exist_ok=True, copy_function=copy)
 
 
 def get_temporary_directory(dir=None):
@@ -26,7 +52,18 @@ def get_temporary_directory(dir=None):
 
 
 def grm(args, cwd=None, is_invalid=False):
-    cmd = subprocess.run([binary] + args, cwd=cwd, capture_output=True, text=True)
+    # Without a cwd, close_fds=False lets subprocess use posix_spawn() instead
+    # of fork() + exec(), which does not have to copy the memory mappings of
+    # the pytest process. Python opens all file descriptors non-inheritable, so
+    # nothing leaks into grm. With a cwd, posix_spawn() is never used, so keep
+    # the default there.
+    cmd = subprocess.run(
+        [binary] + args,
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        close_fds=cwd is not None,
+    )
     if not is_invalid:
         assert "USAGE" not in cmd.stderr
     print(f"grmcmd: {args}")
@@ -47,6 +84,19 @@ def shell(script):
     cmd.check_returncode()
 
 
+def tracked_files(path):
+    """
+    Returns the paths of all files tracked in the repository at `path`.
+    """
+    cmd = subprocess.run(
+        ["git", "-C", path, "ls-files", "-z"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [os.path.join(path, file) for file in cmd.stdout.split("\0") if file]
+
+
 def checksum_directory(path):
     """
     Gives a "checksum" of a directory that includes all files & directories
@@ -70,7 +120,7 @@ def checksum_directory(path):
     if not os.path.exists(path):
         raise f"{path} not found"
 
-    def get_stat_hash(path):
+    def get_stat_hash(stat):
         checksum = hashlib.md5()
 
         # A note about bytes(). You may think that it converts something to
@@ -84,10 +134,6 @@ def checksum_directory(path):
         def int_to_bytes(i):
             return i.to_bytes((i.bit_length() + 7) // 8, byteorder="big")
 
-        # lstat() instead of stat() so symlinks are not followed. So symlinks
-        # are treated as-is and will also be checked for changes.
-        stat = os.lstat(path)
-
         # Note that the list of attributes does not include any timings except
         # mtime.
         for s in [
@@ -101,25 +147,46 @@ def checksum_directory(path):
             checksum.update(int_to_bytes(s))
         return checksum.digest()
 
-    for root, dirs, files in os.walk(path):
-        for file in files:
-            checksum = hashlib.md5()
-            filepath = os.path.join(root, file)
-            checksum.update(str.encode(filepath))
-            checksum.update(get_stat_hash(filepath))
-            with open(filepath, "rb") as f:
+    def get_content_hash(filepath):
+        with open(filepath, "rb") as f:
+            # hashlib.file_digest() is only available with Python >= 3.11
+            if hasattr(hashlib, "file_digest"):
+                digest = hashlib.file_digest(f, "md5").digest()
+            else:
+                checksum = hashlib.md5()
                 while True:
-                    data = f.read(8192)
+                    data = f.read(65536)
                     if not data:
                         break
                     checksum.update(data)
-            hashes.append(checksum.digest())
-
-        for d in dirs:
-            checksum = hashlib.md5()
-            dirpath = os.path.join(root, d)
-            checksum.update(get_stat_hash(dirpath))
-            hashes.append(checksum.digest())
+                digest = checksum.digest()
+        return digest
+
+    # The same as os.walk(), but using the stat information that scandir()
+    # already got instead of doing another lstat() for every entry.
+    def walk(dirpath):
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                # lstat() instead of stat() so symlinks are not followed. So
+                # symlinks are treated as-is and will also be checked for
+                # changes.
+                stat = entry.stat(follow_symlinks=False)
+                if entry.is_dir():
+                    checksum = hashlib.md5()
+                    checksum.update(get_stat_hash(stat))
+                    hashes.append(checksum.digest())
+                    # Like os.walk(), do not descend into symlinked
+                    # directories
+                    if not entry.is_symlink():
+                        walk(entry.path)
+                else:
+                    checksum = hashlib.md5()
+                    checksum.update(str.encode(entry.path))
+                    checksum.update(get_stat_hash(stat))
+                    checksum.update(get_content_hash(entry.path))
+                    hashes.append(checksum.digest())
+
+    walk(path)
 
     checksum = hashlib.md5()
     for c in sorted(hashes):
@@ -127,6 +194,67 @@ def checksum_directory(path):
     return checksum.hexdigest()
 
 
+RepoState = collections.namedtuple(
+    "RepoState", ["bare", "branch", "head", "dirty", "remotes"]
+)
+
+
+def inspect_repo(path):
+    """
+    Returns the state of the repository at `path` that is usually checked
+    after running grm: Whether it is bare, the checked out branch, the commit
+    HEAD points to, whether there are uncommitted changes to tracked files and
+    the URLs of all remotes (as a dict of remote name to list of URLs).
+
+    `branch` is None for a detached HEAD and `head` is None if there are no
+    commits yet.
+
+    GitPython spawns separate `git` processes for a lot of this (`is_dirty()`
+    alone runs `git diff` twice, and so does every access to `Remote.urls`).
+    This gets everything with two `git` invocations for a repository with a
+    working tree.
+    """
+
+    def run(*args):
+        return subprocess.run(
+            ["git", "-C", path] + list(args), capture_output=True, text=True
+        )
+
+    status = run("status", "--porcelain=v2", "--branch", "--untracked-files=no")
+    if status.returncode == 0:
+        bare = False
+        headers = {}
+        dirty = False
+        for line in status.stdout.splitlines():
+            if line.startswith("# "):
+                (key, value) = line[2:].split(" ", 1)
+                headers[key] = value
+            else:
+                dirty = True
+        branch = headers["branch.head"]
+        if branch == "(detached)":
+            branch = None
+        head = headers["branch.oid"]
+        if head == "(initial)":
+            head = None
+    else:
+        # `git status` refuses to work without a working tree
+        assert run("rev-parse", "--is-bare-repository").stdout.strip() == "true"
+        bare = True
+        dirty = False
+        branch = run("symbolic-ref", "--quiet", "--short", "HEAD").stdout.strip()
+        branch = branch or None
+        head = run("rev-parse", "--quiet", "--verify", "HEAD").stdout.strip()
+        head = head or None
+
+    remotes = {}
+    for line in run("config", "--get-regexp", r"^remote\..*\.url$").stdout.splitlines():
+        (key, url) = line.split(" ", 1)
+        remotes.setdefault(key[len("remote.") : -len(".url")], []).append(url)
+
+    return RepoState(bare, branch, head, dirty, remotes)
+
+
 class TempGitRepository:
     def __init__(self, dir=None):
         self.dir = dir
@@ -394,27 +522,42 @@ class NonGitDir:
 
 
 class TempGitFileRemote:
+    template = None
+
     def __init__(self):
         pass
 
+    @classmethod
+    def get_template(cls):
+        """
+        All file remotes have the same content, so the repository is only
+        created once and then copied for each user.
+        """
+        if cls.template is None:
+            tmpdir = get_temporary_directory()
+            shell(
+                f"""
+                cd {tmpdir.name}
+                git -c init.defaultBranch=master init
+                echo test > root-commit-in-remote-1
+                git add root-commit-in-remote-1
+                git commit -m "root-commit-in-remote-1"
+                echo test > root-commit-in-remote-2
+                git add root-commit-in-remote-2
+                git commit -m "root-commit-in-remote-2"
+                git ls-files | xargs rm -rf
+                mv .git/* .
+                git config core.bare true
+            """
+            )
+            head_commit_sha = git.Repo(tmpdir.name).head.commit.hexsha
+            cls.template = (tmpdir, head_commit_sha)
+        return cls.template
+
     def __enter__(self):
+        (template, head_commit_sha) = self.get_template()
         self.tmpdir = get_temporary_directory()
-        shell(
-            f"""
-            cd {self.tmpdir.name}
-            git -c init.defaultBranch=master init
-            echo test > root-commit-in-remote-1
-            git add root-commit-in-remote-1
-            git commit -m "root-commit-in-remote-1"
-            echo test > root-commit-in-remote-2
-            git add root-commit-in-remote-2
-            git commit -m "root-commit-in-remote-2"
-            git ls-files | xargs rm -rf
-            mv .git/* .
-            git config core.bare true
-        """
-        )
-        head_commit_sha = git.Repo(self.tmpdir.name).head.commit.hexsha
+        copytree(template.name, self.tmpdir.name)
         return (self.tmpdir.name, head_commit_sha)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
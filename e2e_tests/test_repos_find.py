@@ -2,10 +2,16 @@
 
 import tempfile
 
-import toml
 import pytest
 import yaml
 
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11 (e.g. the docker image) does not have tomllib, but the
+    # toml package provides the same loads()
+    import toml as tomllib
+
 from helpers import *
 
 
@@ -106,7 +112,7 @@ def test_repos_find(configtype, default):
         assert len(cmd.stderr) == 0
 
         if default or configtype == "toml":
-            output = toml.loads(cmd.stdout)
+            output = tomllib.loads(cmd.stdout)
         elif configtype == "yaml":
             output = yaml.safe_load(cmd.stdout)
         else:
@@ -161,7 +167,7 @@ def test_repos_find_in_root(configtype, default):
         assert len(cmd.stderr) == 0
 
         if default or configtype == "toml":
-            output = toml.loads(cmd.stdout)
+            output = tomllib.loads(cmd.stdout)
         elif configtype == "yaml":
             output = yaml.safe_load(cmd.stdout)
         else:
@@ -236,7 +242,7 @@ def test_repos_find_with_invalid_repo(configtype, default):
         assert "broken" in cmd.stderr
 
         if default or configtype == "toml":
-            output = toml.loads(cmd.stdout)
+            output = tomllib.loads(cmd.stdout)
         elif configtype == "yaml":
             output = yaml.safe_load(cmd.stdout)
         else:
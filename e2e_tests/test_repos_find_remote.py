@@ -3,10 +3,16 @@
 import re
 import os
 
-import toml
 import pytest
 import yaml
 
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11 (e.g. the docker image) does not have tomllib, but the
+    # toml package provides the same loads()
+    import toml as tomllib
+
 from helpers import *
 
 
@@ -169,7 +175,7 @@ def test_repos_find_remote_no_filter(provider, configtype, default, use_config):
     assert len(cmd.stderr) == 0
 
     if default or configtype == "toml":
-        output = toml.loads(cmd.stdout)
+        output = tomllib.loads(cmd.stdout)
     elif configtype == "yaml":
         output = yaml.safe_load(cmd.stdout)
     else:
@@ -227,7 +233,7 @@ def test_repos_find_remote_user_empty(
     assert len(cmd.stderr) == 0
 
     if configtype_default or configtype == "toml":
-        output = toml.loads(cmd.stdout)
+        output = tomllib.loads(cmd.stdout)
     elif configtype == "yaml":
         output = yaml.safe_load(cmd.stdout)
     else:
@@ -334,7 +340,7 @@ def test_repos_find_remote_user(
     assert len(cmd.stderr) == 0
 
     if configtype_default or configtype == "toml":
-        output = toml.loads(cmd.stdout)
+        output = tomllib.loads(cmd.stdout)
     elif configtype == "yaml":
         output = yaml.safe_load(cmd.stdout)
     else:
@@ -349,10 +355,9 @@ def test_repos_find_remote_user(
     assert isinstance(output["trees"][0]["repos"], list)
     assert len(output["trees"][0]["repos"]) == 5
 
+    repos = {r["name"]: r for r in output["trees"][0]["repos"]}
     for i in range(1, 6):
-        repo = [r for r in output["trees"][0]["repos"] if r["name"] == f"myproject{i}"][
-            0
-        ]
+        repo = repos[f"myproject{i}"]
         assert repo["worktree_setup"] is (not worktree_default and worktree)
         assert isinstance(repo["remotes"], list)
         assert len(repo["remotes"]) == 1
@@ -433,7 +438,7 @@ def test_repos_find_remote_group_empty(
     assert len(cmd.stderr) == 0
 
     if configtype_default or configtype == "toml":
-        output = toml.loads(cmd.stdout)
+        output = tomllib.loads(cmd.stdout)
     elif configtype == "yaml":
         output = yaml.safe_load(cmd.stdout)
     else:
@@ -521,7 +526,7 @@ def test_repos_find_remote_group(
     assert len(cmd.stderr) == 0
 
     if configtype_default or configtype == "toml":
-        output = toml.loads(cmd.stdout)
+        output = tomllib.loads(cmd.stdout)
     elif configtype == "yaml":
         output = yaml.safe_load(cmd.stdout)
     else:
@@ -536,10 +541,9 @@ def test_repos_find_remote_group(
     assert isinstance(output["trees"][0]["repos"], list)
     assert len(output["trees"][0]["repos"]) == 5
 
+    repos = {r["name"]: r for r in output["trees"][0]["repos"]}
     for i in range(1, 6):
-        repo = [r for r in output["trees"][0]["repos"] if r["name"] == f"myproject{i}"][
-            0
-        ]
+        repo = repos[f"myproject{i}"]
         assert repo["worktree_setup"] is (not worktree_default and worktree)
         assert isinstance(repo["remotes"], list)
         assert len(repo["remotes"]) == 1
@@ -646,7 +650,7 @@ def test_repos_find_remote_user_and_group(
     assert len(cmd.stderr) == 0
 
     if configtype_default or configtype == "toml":
-        output = toml.loads(cmd.stdout)
+        output = tomllib.loads(cmd.stdout)
     elif configtype == "yaml":
         output = yaml.safe_load(cmd.stdout)
     else:
@@ -657,14 +661,17 @@ def test_repos_find_remote_user_and_group(
     assert isinstance(output["trees"], list)
     assert len(output["trees"]) == 2
 
-    user_namespace = [t for t in output["trees"] if t["root"] == "/myroot/myuser1"][0]
+    trees = {t["root"]: t for t in output["trees"]}
+
+    user_namespace = trees["/myroot/myuser1"]
 
     assert set(user_namespace.keys()) == {"root", "repos"}
     assert isinstance(user_namespace["repos"], list)
     assert len(user_namespace["repos"]) == 5
 
+    repos = {r["name"]: r for r in user_namespace["repos"]}
     for i in range(1, 6):
-        repo = [r for r in user_namespace["repos"] if r["name"] == f"myproject{i}"][0]
+        repo = repos[f"myproject{i}"]
         assert repo["worktree_setup"] is (not worktree_default and worktree)
         assert isinstance(repo["remotes"], list)
         assert len(repo["remotes"]) == 1
@@ -682,14 +689,15 @@ def test_repos_find_remote_user_and_group(
             )
             assert repo["remotes"][0]["type"] == "https"
 
-    group_namespace = [t for t in output["trees"] if t["root"] == "/myroot/mygroup1"][0]
+    group_namespace = trees["/myroot/mygroup1"]
 
     assert set(group_namespace.keys()) == {"root", "repos"}
     assert isinstance(group_namespace["repos"], list)
     assert len(group_namespace["repos"]) == 5
 
+    repos = {r["name"]: r for r in group_namespace["repos"]}
     for i in range(1, 6):
-        repo = [r for r in group_namespace["repos"] if r["name"] == f"myproject{i}"][0]
+        repo = repos[f"myproject{i}"]
         assert repo["worktree_setup"] is (not worktree_default and worktree)
         assert isinstance(repo["remotes"], list)
         assert len(repo["remotes"]) == 1
@@ -797,7 +805,7 @@ def test_repos_find_remote_owner(
     assert len(cmd.stderr) == 0
 
     if configtype_default or configtype == "toml":
-        output = toml.loads(cmd.stdout)
+        output = tomllib.loads(cmd.stdout)
     elif configtype == "yaml":
         output = yaml.safe_load(cmd.stdout)
     else:
@@ -808,7 +816,9 @@ def test_repos_find_remote_owner(
     assert isinstance(output["trees"], list)
     assert len(output["trees"]) == 4
 
-    user_namespace_1 = [t for t in output["trees"] if t["root"] == "/myroot/myuser1"][0]
+    trees = {t["root"]: t for t in output["trees"]}
+
+    user_namespace_1 = trees["/myroot/myuser1"]
 
     assert set(user_namespace_1.keys()) == {"root", "repos"}
     assert isinstance(user_namespace_1["repos"], list)
@@ -816,10 +826,9 @@ def test_repos_find_remote_owner(
     if with_user_filter:
         assert len(user_namespace_1["repos"]) == 5
 
+        repos = {r["name"]: r for r in user_namespace_1["repos"]}
         for i in range(1, 6):
-            repo = [
-                r for r in user_namespace_1["repos"] if r["name"] == f"myproject{i}"
-            ][0]
+            repo = repos[f"myproject{i}"]
             assert repo["worktree_setup"] is (not worktree_default and worktree)
             assert isinstance(repo["remotes"], list)
             assert len(repo["remotes"]) == 1
@@ -839,10 +848,9 @@ def test_repos_find_remote_owner(
     else:
         assert len(user_namespace_1["repos"]) == 2
 
+        repos = {r["name"]: r for r in user_namespace_1["repos"]}
         for i in range(1, 3):
-            repo = [
-                r for r in user_namespace_1["repos"] if r["name"] == f"myproject{i}"
-            ][0]
+            repo = repos[f"myproject{i}"]
             assert repo["worktree_setup"] is (not worktree_default and worktree)
             assert isinstance(repo["remotes"], list)
             assert len(repo["remotes"]) == 1
@@ -860,7 +868,7 @@ def test_repos_find_remote_owner(
                 )
                 assert repo["remotes"][0]["type"] == "https"
 
-    user_namespace_2 = [t for t in output["trees"] if t["root"] == "/myroot/myuser2"][0]
+    user_namespace_2 = trees["/myroot/myuser2"]
 
     assert set(user_namespace_2.keys()) == {"root", "repos"}
     assert isinstance(user_namespace_2["repos"], list)
@@ -882,9 +890,7 @@ def test_repos_find_remote_owner(
         )
         assert repo["remotes"][0]["type"] == "https"
 
-    group_namespace_1 = [t for t in output["trees"] if t["root"] == "/myroot/mygroup1"][
-        0
-    ]
+    group_namespace_1 = trees["/myroot/mygroup1"]
 
     assert set(group_namespace_1.keys()) == {"root", "repos"}
     assert isinstance(group_namespace_1["repos"], list)
@@ -892,10 +898,9 @@ def test_repos_find_remote_owner(
     if with_group_filter:
         assert len(group_namespace_1["repos"]) == 5
 
+        repos = {r["name"]: r for r in group_namespace_1["repos"]}
         for i in range(1, 6):
-            repo = [
-                r for r in group_namespace_1["repos"] if r["name"] == f"myproject{i}"
-            ][0]
+            repo = repos[f"myproject{i}"]
             assert repo["worktree_setup"] is (not worktree_default and worktree)
             assert isinstance(repo["remotes"], list)
             assert len(repo["remotes"]) == 1
@@ -933,9 +938,7 @@ def test_repos_find_remote_owner(
             )
             assert repo["remotes"][0]["type"] == "https"
 
-    group_namespace_2 = [t for t in output["trees"] if t["root"] == "/myroot/mygroup2"][
-        0
-    ]
+    group_namespace_2 = trees["/myroot/mygroup2"]
 
     assert set(group_namespace_2.keys()) == {"root", "repos"}
     assert isinstance(group_namespace_2["repos"], list)
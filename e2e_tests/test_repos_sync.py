@@ -5,8 +5,6 @@ import re
 import textwrap
 
 import pytest
-import toml
-import git
 
 from helpers import *
 
@@ -206,6 +204,11 @@ templates = {
 }
 
 
+def write_config(path, template, configtype, **kwargs):
+    with open(path, "w") as f:
+        f.write(templates[template][configtype].format(**kwargs))
+
+
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
 def test_repos_sync_config_is_valid_symlink(configtype):
     with tempfile.TemporaryDirectory() as target:
@@ -215,26 +218,26 @@ def test_repos_sync_config_is_valid_symlink(configtype):
                     config_symlink = os.path.join(config_dir, "cfglink")
                     os.symlink(config.name, config_symlink)
 
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote, remotename="origin"
-                            )
-                        )
-
-                    subprocess.run(["cat", config.name])
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config_symlink])
                     assert cmd.returncode == 0
 
                     git_dir = os.path.join(target, "test")
                     assert os.path.exists(git_dir)
-                    with git.Repo(git_dir) as repo:
-                        assert not repo.bare
-                        assert not repo.is_dirty()
-                        assert set([str(r) for r in repo.remotes]) == {"origin"}
-                        assert str(repo.active_branch) == "master"
-                        assert str(repo.head.commit) == head_commit_sha
+                    state = inspect_repo(git_dir)
+                    assert not state.bare
+                    assert not state.dirty
+                    assert set(state.remotes) == {"origin"}
+                    assert state.branch == "master"
+                    assert state.head == head_commit_sha
 
 
 def test_repos_sync_config_is_invalid_symlink():
@@ -265,8 +268,8 @@ def test_repos_sync_config_is_directory():
 def test_repos_sync_config_is_unreadable():
     with tempfile.TemporaryDirectory() as config_dir:
         config_path = os.path.join(config_dir, "cfg")
-        open(config_path, "w")
-        os.chmod(config_path, 0o0000)
+        # Create the file without any permissions right away
+        os.close(os.open(config_path, os.O_WRONLY | os.O_CREAT, 0o0000))
         cmd = grm(["repos", "sync", "config", "--config", config_path])
 
         assert os.path.exists(config_path)
@@ -279,8 +282,7 @@ def test_repos_sync_unmanaged_repos(configtype):
     with tempfile.TemporaryDirectory() as root:
         with TempGitRepository(dir=root) as unmanaged_repo:
             with tempfile.NamedTemporaryFile() as config:
-                with open(config.name, "w") as f:
-                    f.write(templates["repo_simple"][configtype].format(root=root))
+                write_config(config.name, "repo_simple", configtype, root=root)
 
                 cmd = grm(["repos", "sync", "config", "--config", config.name])
                 assert cmd.returncode == 0
@@ -290,16 +292,18 @@ def test_repos_sync_unmanaged_repos(configtype):
 
                 # this removes the prefix (root) from the path (unmanaged_repo)
                 unmanaged_repo_name = os.path.relpath(unmanaged_repo, root)
-                regex = f".*unmanaged.*{unmanaged_repo_name}"
-                assert any([re.match(regex, l) for l in cmd.stderr.lower().split("\n")])
+                assert re.search(
+                    f"unmanaged.*{re.escape(unmanaged_repo_name)}",
+                    cmd.stderr,
+                    re.IGNORECASE,
+                )
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
 def test_repos_sync_root_is_file(configtype):
     with tempfile.NamedTemporaryFile() as target:
         with tempfile.NamedTemporaryFile() as config:
-            with open(config.name, "w") as f:
-                f.write(templates["repo_simple"][configtype].format(root=target.name))
+            write_config(config.name, "repo_simple", configtype, root=target.name)
 
             cmd = grm(["repos", "sync", "config", "--config", config.name])
             assert cmd.returncode != 0
@@ -312,36 +316,34 @@ def test_repos_sync_normal_clone(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_two_remotes"][configtype].format(
-                                root=target, remote1=remote1, remote2=remote2
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "repo_with_two_remotes",
+                        configtype,
+                        root=target,
+                        remote1=remote1,
+                        remote2=remote2,
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
 
                     git_dir = os.path.join(target, "test")
                     assert os.path.exists(git_dir)
-                    with git.Repo(git_dir) as repo:
-                        assert not repo.bare
-                        assert not repo.is_dirty()
-                        assert set([str(r) for r in repo.remotes]) == {
-                            "origin",
-                            "origin2",
-                        }
-                        assert str(repo.active_branch) == "master"
-                        assert str(repo.head.commit) == remote1_head_commit_sha
+                    state = inspect_repo(git_dir)
+                    assert not state.bare
+                    assert not state.dirty
+                    assert set(state.remotes) == {
+                        "origin",
+                        "origin2",
+                    }
+                    assert state.branch == "master"
+                    assert state.head == remote1_head_commit_sha
 
-                        assert len(repo.remotes) == 2
-                        urls = list(repo.remote("origin").urls)
-                        assert len(urls) == 1
-                        assert urls[0] == f"file://{remote1}"
+                    assert len(state.remotes) == 2
+                    assert state.remotes["origin"] == [f"file://{remote1}"]
 
-                        urls = list(repo.remote("origin2").urls)
-                        assert len(urls) == 1
-                        assert urls[0] == f"file://{remote2}"
+                    assert state.remotes["origin2"] == [f"file://{remote2}"]
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
@@ -349,29 +351,28 @@ def test_repos_sync_repo_in_subdirectory(configtype):
     with tempfile.TemporaryDirectory() as target:
         with TempGitFileRemote() as (remote, remote_head_commit_sha):
             with tempfile.NamedTemporaryFile() as config:
-                with open(config.name, "w") as f:
-                    f.write(
-                        templates["repo_in_subdirectory"][configtype].format(
-                            root=target, remote=remote
-                        )
-                    )
+                write_config(
+                    config.name,
+                    "repo_in_subdirectory",
+                    configtype,
+                    root=target,
+                    remote=remote,
+                )
 
                 cmd = grm(["repos", "sync", "config", "--config", config.name])
                 assert cmd.returncode == 0
 
                 git_dir = os.path.join(target, "outer", "inner")
                 assert os.path.exists(git_dir)
-                with git.Repo(git_dir) as repo:
-                    assert not repo.bare
-                    assert not repo.is_dirty()
-                    assert set([str(r) for r in repo.remotes]) == {"origin"}
-                    assert str(repo.active_branch) == "master"
-                    assert str(repo.head.commit) == remote_head_commit_sha
-
-                    assert len(repo.remotes) == 1
-                    urls = list(repo.remote("origin").urls)
-                    assert len(urls) == 1
-                    assert urls[0] == f"file://{remote}"
+                state = inspect_repo(git_dir)
+                assert not state.bare
+                assert not state.dirty
+                assert set(state.remotes) == {"origin"}
+                assert state.branch == "master"
+                assert state.head == remote_head_commit_sha
+
+                assert len(state.remotes) == 1
+                assert state.remotes["origin"] == [f"file://{remote}"]
 
                 cmd = grm(["repos", "sync", "config", "--config", config.name])
                 assert not "found unmanaged repository" in cmd.stderr.lower()
@@ -383,29 +384,29 @@ def test_repos_sync_nested_clone(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["nested_trees"][configtype].format(
-                                root=target, remote1=remote1, remote2=remote2
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "nested_trees",
+                        configtype,
+                        root=target,
+                        remote1=remote1,
+                        remote2=remote2,
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
 
                     def validate(git_dir, sha, remote):
                         assert os.path.exists(git_dir)
-                        with git.Repo(git_dir) as repo:
-                            assert not repo.bare
-                            assert not repo.is_dirty()
-                            assert set([str(r) for r in repo.remotes]) == {"origin"}
-                            assert str(repo.active_branch) == "master"
-                            assert str(repo.head.commit) == sha
-
-                            assert len(repo.remotes) == 1
-                            urls = list(repo.remote("origin").urls)
-                            assert len(urls) == 1
-                            assert urls[0] == f"file://{remote}"
+                        state = inspect_repo(git_dir)
+                        assert not state.bare
+                        assert not state.dirty
+                        assert set(state.remotes) == {"origin"}
+                        assert state.branch == "master"
+                        assert state.head == sha
+
+                        assert len(state.remotes) == 1
+                        assert state.remotes["origin"] == [f"file://{remote}"]
 
                     validate(
                         os.path.join(target, "outer"), remote1_head_commit_sha, remote1
@@ -426,20 +427,19 @@ def test_repos_sync_nested_clone(configtype):
 def test_repos_sync_normal_init(configtype):
     with tempfile.TemporaryDirectory() as target:
         with tempfile.NamedTemporaryFile() as config:
-            with open(config.name, "w") as f:
-                f.write(templates["repo_simple"][configtype].format(root=target))
+            write_config(config.name, "repo_simple", configtype, root=target)
 
             cmd = grm(["repos", "sync", "config", "--config", config.name])
             assert cmd.returncode == 0
 
             git_dir = os.path.join(target, "test")
             assert os.path.exists(git_dir)
-            with git.Repo(git_dir) as repo:
-                assert not repo.bare
-                assert not repo.is_dirty()
-                # as there are no commits yet, HEAD does not point to anything
-                # valid
-                assert not repo.head.is_valid()
+            state = inspect_repo(git_dir)
+            assert not state.bare
+            assert not state.dirty
+            # as there are no commits yet, HEAD does not point to anything
+            # valid
+            assert state.head is None
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
@@ -448,12 +448,14 @@ def test_repos_sync_normal_add_remote(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote1, remotename="origin"
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote1,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
@@ -461,35 +463,33 @@ def test_repos_sync_normal_add_remote(configtype):
                     git_dir = os.path.join(target, "test")
 
                     assert os.path.exists(git_dir)
-                    with git.Repo(git_dir) as repo:
-                        assert not repo.bare
-                        assert not repo.is_dirty()
-                        assert set([str(r) for r in repo.remotes]) == {"origin"}
-                        assert str(repo.active_branch) == "master"
-                        assert str(repo.head.commit) == remote1_head_commit_sha
-
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_two_remotes"][configtype].format(
-                                root=target, remote1=remote1, remote2=remote2
-                            )
-                        )
+                    state = inspect_repo(git_dir)
+                    assert not state.bare
+                    assert not state.dirty
+                    assert set(state.remotes) == {"origin"}
+                    assert state.branch == "master"
+                    assert state.head == remote1_head_commit_sha
+
+                    write_config(
+                        config.name,
+                        "repo_with_two_remotes",
+                        configtype,
+                        root=target,
+                        remote1=remote1,
+                        remote2=remote2,
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
-                    with git.Repo(git_dir) as repo:
-                        assert set([str(r) for r in repo.remotes]) == {
-                            "origin",
-                            "origin2",
-                        }
+                    state = inspect_repo(git_dir)
+                    assert set(state.remotes) == {
+                        "origin",
+                        "origin2",
+                    }
 
-                        urls = list(repo.remote("origin").urls)
-                        assert len(urls) == 1
-                        assert urls[0] == f"file://{remote1}"
+                    assert state.remotes["origin"] == [f"file://{remote1}"]
 
-                        urls = list(repo.remote("origin2").urls)
-                        assert len(urls) == 1
-                        assert urls[0] == f"file://{remote2}"
+                    assert state.remotes["origin2"] == [f"file://{remote2}"]
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
@@ -498,12 +498,14 @@ def test_repos_sync_normal_remove_remote(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_two_remotes"][configtype].format(
-                                root=target, remote1=remote1, remote2=remote2
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "repo_with_two_remotes",
+                        configtype,
+                        root=target,
+                        remote1=remote1,
+                        remote2=remote2,
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
@@ -511,50 +513,31 @@ def test_repos_sync_normal_remove_remote(configtype):
                     git_dir = os.path.join(target, "test")
 
                     assert os.path.exists(git_dir)
-                    with git.Repo(git_dir) as repo:
-                        assert not repo.bare
-                        assert not repo.is_dirty()
-                        assert set([str(r) for r in repo.remotes]) == {
-                            "origin",
-                            "origin2",
-                        }
-                        assert str(repo.active_branch) == "master"
-                        assert str(repo.head.commit) == remote1_head_commit_sha
-
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote2, remotename="origin2"
-                            )
-                        )
+                    state = inspect_repo(git_dir)
+                    assert not state.bare
+                    assert not state.dirty
+                    assert set(state.remotes) == {
+                        "origin",
+                        "origin2",
+                    }
+                    assert state.branch == "master"
+                    assert state.head == remote1_head_commit_sha
+
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote2,
+                        remotename="origin2",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
-                    shell(f"cd {git_dir} && git remote -v")
-                    with git.Repo(git_dir) as repo:
-                        """
-                        There is some bug(?) in GitPython. It does not properly
-                        detect removed remotes. It will still report the old
-                        remove in repo.remotes.
-
-                        So instead, we make sure that we get an Exception when
-                        we try to access the old remove via repo.remote().
-
-                        Note that repo.remote() checks the actual repo lazily.
-                        Even `exists()` seems to just check against repo.remotes
-                        and will return True even if the remote is not actually
-                        configured. So we have to force GitPython to hit the filesystem.
-                        calling Remotes.urls does. But it returns an iterator
-                        that first has to be unwrapped via list(). Only THEN
-                        do we actually get an exception of the remotes does not
-                        exist.
-                        """
-                        with pytest.raises(git.exc.GitCommandError):
-                            list(repo.remote("origin").urls)
-
-                        urls = list(repo.remote("origin2").urls)
-                        assert len(urls) == 1
-                        assert urls[0] == f"file://{remote2}"
+                    state = inspect_repo(git_dir)
+                    assert "origin" not in state.remotes
+
+                    assert state.remotes["origin2"] == [f"file://{remote2}"]
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
@@ -563,12 +546,14 @@ def test_repos_sync_normal_change_remote_url(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote1, remotename="origin"
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote1,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
@@ -576,28 +561,28 @@ def test_repos_sync_normal_change_remote_url(configtype):
                     git_dir = os.path.join(target, "test")
 
                     assert os.path.exists(git_dir)
-                    with git.Repo(git_dir) as repo:
-                        assert not repo.bare
-                        assert not repo.is_dirty()
-                        assert set([str(r) for r in repo.remotes]) == {"origin"}
-                        assert str(repo.active_branch) == "master"
-                        assert str(repo.head.commit) == remote1_head_commit_sha
-
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote2, remotename="origin"
-                            )
-                        )
+                    state = inspect_repo(git_dir)
+                    assert not state.bare
+                    assert not state.dirty
+                    assert set(state.remotes) == {"origin"}
+                    assert state.branch == "master"
+                    assert state.head == remote1_head_commit_sha
+
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote2,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
-                    with git.Repo(git_dir) as repo:
-                        assert set([str(r) for r in repo.remotes]) == {"origin"}
+                    state = inspect_repo(git_dir)
+                    assert set(state.remotes) == {"origin"}
 
-                        urls = list(repo.remote("origin").urls)
-                        assert len(urls) == 1
-                        assert urls[0] == f"file://{remote2}"
+                    assert state.remotes["origin"] == [f"file://{remote2}"]
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
@@ -606,12 +591,14 @@ def test_repos_sync_normal_change_remote_name(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote1, remotename="origin"
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote1,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
@@ -619,31 +606,28 @@ def test_repos_sync_normal_change_remote_name(configtype):
                     git_dir = os.path.join(target, "test")
 
                     assert os.path.exists(git_dir)
-                    with git.Repo(git_dir) as repo:
-                        assert not repo.bare
-                        assert not repo.is_dirty()
-                        assert set([str(r) for r in repo.remotes]) == {"origin"}
-                        assert str(repo.active_branch) == "master"
-                        assert str(repo.head.commit) == remote1_head_commit_sha
-
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote1, remotename="origin2"
-                            )
-                        )
+                    state = inspect_repo(git_dir)
+                    assert not state.bare
+                    assert not state.dirty
+                    assert set(state.remotes) == {"origin"}
+                    assert state.branch == "master"
+                    assert state.head == remote1_head_commit_sha
+
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote1,
+                        remotename="origin2",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
-                    with git.Repo(git_dir) as repo:
-                        # See the note in `test_repos_sync_normal_remove_remote()`
-                        # about repo.remotes
-                        with pytest.raises(git.exc.GitCommandError):
-                            list(repo.remote("origin").urls)
+                    state = inspect_repo(git_dir)
+                    assert "origin" not in state.remotes
 
-                        urls = list(repo.remote("origin2").urls)
-                        assert len(urls) == 1
-                        assert urls[0] == f"file://{remote1}"
+                    assert state.remotes["origin2"] == [f"file://{remote1}"]
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
@@ -652,12 +636,14 @@ def test_repos_sync_worktree_clone(configtype, init_worktree):
     with tempfile.TemporaryDirectory() as target:
         with TempGitFileRemote() as (remote, head_commit_sha):
             with tempfile.NamedTemporaryFile() as config:
-                with open(config.name, "w") as f:
-                    f.write(
-                        templates["worktree_repo_with_remote"][configtype].format(
-                            root=target, remote=remote, remotename="origin"
-                        )
-                    )
+                write_config(
+                    config.name,
+                    "worktree_repo_with_remote",
+                    configtype,
+                    root=target,
+                    remote=remote,
+                    remotename="origin",
+                )
 
                 args = ["repos", "sync", "config", "--config", config.name]
                 if init_worktree is True:
@@ -682,23 +668,20 @@ def test_repos_sync_worktree_clone(configtype, init_worktree):
                             ".git-main-working-tree"
                         }
 
-                    with git.Repo(
+                    state = inspect_repo(
                         os.path.join(worktree_dir, ".git-main-working-tree")
-                    ) as repo:
-                        assert repo.bare
-                        assert set([str(r) for r in repo.remotes]) == {"origin"}
-                        assert str(repo.active_branch) == "master"
-                        assert str(repo.head.commit) == head_commit_sha
+                    )
+                    assert state.bare
+                    assert set(state.remotes) == {"origin"}
+                    assert state.branch == "master"
+                    assert state.head == head_commit_sha
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
 def test_repos_sync_worktree_init(configtype):
     with tempfile.TemporaryDirectory() as target:
         with tempfile.NamedTemporaryFile() as config:
-            with open(config.name, "w") as f:
-                f.write(
-                    templates["worktree_repo_simple"][configtype].format(root=target)
-                )
+            write_config(config.name, "worktree_repo_simple", configtype, root=target)
 
             cmd = grm(["repos", "sync", "config", "--config", config.name])
             assert cmd.returncode == 0
@@ -707,11 +690,11 @@ def test_repos_sync_worktree_init(configtype):
             assert os.path.exists(worktree_dir)
 
             assert set(os.listdir(worktree_dir)) == {".git-main-working-tree"}
-            with git.Repo(os.path.join(worktree_dir, ".git-main-working-tree")) as repo:
-                assert repo.bare
-                # as there are no commits yet, HEAD does not point to anything
-                # valid
-                assert not repo.head.is_valid()
+            state = inspect_repo(os.path.join(worktree_dir, ".git-main-working-tree"))
+            assert state.bare
+            # as there are no commits yet, HEAD does not point to anything
+            # valid
+            assert state.head is None
 
 
 @pytest.mark.parametrize("configtype", ["toml", "yaml"])
@@ -745,12 +728,14 @@ def test_repos_sync_unchanged(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_two_remotes"][configtype].format(
-                                root=target, remote1=remote1, remote2=remote2
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "repo_with_two_remotes",
+                        configtype,
+                        root=target,
+                        remote1=remote1,
+                        remote2=remote2,
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
@@ -769,24 +754,28 @@ def test_repos_sync_normal_change_to_worktree(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote1, remotename="origin"
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote1,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
 
                     git_dir = os.path.join(target, "test")
 
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["worktree_repo_with_remote"][configtype].format(
-                                root=target, remote=remote1, remotename="origin"
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "worktree_repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote1,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode != 0
@@ -800,24 +789,28 @@ def test_repos_sync_worktree_change_to_normal(configtype):
         with TempGitFileRemote() as (remote1, remote1_head_commit_sha):
             with TempGitFileRemote() as (remote2, remote2_head_commit_sha):
                 with tempfile.NamedTemporaryFile() as config:
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["worktree_repo_with_remote"][configtype].format(
-                                root=target, remote=remote1, remotename="origin"
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "worktree_repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote1,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode == 0
 
                     git_dir = os.path.join(target, "test")
 
-                    with open(config.name, "w") as f:
-                        f.write(
-                            templates["repo_with_remote"][configtype].format(
-                                root=target, remote=remote1, remotename="origin"
-                            )
-                        )
+                    write_config(
+                        config.name,
+                        "repo_with_remote",
+                        configtype,
+                        root=target,
+                        remote=remote1,
+                        remotename="origin",
+                    )
 
                     cmd = grm(["repos", "sync", "config", "--config", config.name])
                     assert cmd.returncode != 0
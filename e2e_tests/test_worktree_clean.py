@@ -51,7 +51,8 @@ def test_worktree_clean_refusal_uncommited_changes_changed_file():
         cmd = grm(["wt", "add", "test", "--track", "origin/test"], cwd=base_dir)
         assert cmd.returncode == 0
 
-        shell(f"cd {base_dir}/test && git ls-files | shuf | head | xargs rm -rf")
+        for file in tracked_files(f"{base_dir}/test"):
+            os.remove(file)
 
         before = checksum_directory(f"{base_dir}/test")
         cmd = grm(["wt", "clean"], cwd=base_dir)
@@ -67,9 +68,9 @@ def test_worktree_clean_refusal_uncommited_changes_cleand_file():
         cmd = grm(["wt", "add", "test", "--track", "origin/test"], cwd=base_dir)
         assert cmd.returncode == 0
 
-        shell(
-            f"cd {base_dir}/test && git ls-files | shuf | head | while read f ; do echo $RANDOM > $f ; done"
-        )
+        for file in tracked_files(f"{base_dir}/test"):
+            with open(file, "w") as f:
+                f.write("changed\n")
 
         before = checksum_directory(f"{base_dir}/test")
         cmd = grm(["wt", "clean"], cwd=base_dir)
@@ -103,9 +104,9 @@ def test_worktree_clean_refusal_tracking_branch_mismatch():
         cmd = grm(["wt", "add", "test", "--track", "origin/test"], cwd=base_dir)
         assert cmd.returncode == 0
 
-        shell(
-            f"cd {base_dir}/test && git push origin test && git reset --hard origin/test^"
-        )
+        # `wt add --track` already made sure that origin/test exists and points
+        # to the same commit as the local branch, so there is no need to push
+        shell(f"cd {base_dir}/test && git reset --hard origin/test^")
 
         before = checksum_directory(f"{base_dir}/test")
         cmd = grm(["wt", "clean"], cwd=base_dir)
@@ -172,18 +173,12 @@ def test_worktree_clean_configured_default_branch(
         shell(
             f"""
             cd {base_dir}
-            (
-                cd ./test
-                touch change
-                git add change
-                git commit -m commit
-            )
+            touch ./test/change
+            git -C ./test add change
+            git -C ./test commit -m commit
 
             git --git-dir ./.git-main-working-tree worktree add mybranch
-            (
-                cd ./mybranch
-                git merge --no-ff test
-            )
+            git -C ./mybranch merge --no-ff test
             git --git-dir ./.git-main-working-tree worktree remove mybranch
         """
         )
@@ -46,20 +46,16 @@ def test_worktree_clean_branch_merged_into_persistent():
         cmd = grm(["wt", "add", "test", "--track", "origin/test"], cwd=base_dir)
         assert cmd.returncode == 0
 
+        cmd = grm(["wt", "add", "master"], cwd=base_dir)
+        assert cmd.returncode == 0
+
         shell(
             f"""
             cd {base_dir}/test
             touch change1
             git add change1
             git commit -m "commit1"
-            """
-        )
 
-        cmd = grm(["wt", "add", "master"], cwd=base_dir)
-        assert cmd.returncode == 0
-
-        shell(
-            f"""
             cd {base_dir}/master
             git merge --no-ff test
             """
@@ -118,20 +114,16 @@ def test_worktree_delete_branch_merged_into_persistent():
         cmd = grm(["wt", "add", "test", "--track", "origin/test"], cwd=base_dir)
         assert cmd.returncode == 0
 
+        cmd = grm(["wt", "add", "master"], cwd=base_dir)
+        assert cmd.returncode == 0
+
         shell(
             f"""
             cd {base_dir}/test
             touch change1
             git add change1
             git commit -m "commit1"
-            """
-        )
 
-        cmd = grm(["wt", "add", "master"], cwd=base_dir)
-        assert cmd.returncode == 0
-
-        shell(
-            f"""
             cd {base_dir}/master
             git merge --no-ff test
             """
@@ -8,6 +8,7 @@ import pytest
 import git
 
 
+@pytest.mark.slow
 def test_worktree_fetch():
     with TempGitRepositoryWorktree.get(funcname()) as (base_dir, root_commit):
         with TempGitFileRemote() as (remote_path, _remote_sha):
@@ -23,8 +24,16 @@ def test_worktree_fetch():
             assert cmd.returncode == 0
 
             repo = git.Repo(f"{base_dir}/.git-main-working-tree")
-            assert repo.commit("master").hexsha == repo.commit("origin/master").hexsha
-            assert repo.commit("master").hexsha == repo.commit("upstream/master").hexsha
+
+            def heads():
+                return tuple(
+                    repo.commit(ref).hexsha
+                    for ref in ("master", "origin/master", "upstream/master")
+                )
+
+            (master, origin, upstream) = heads()
+            assert master == origin
+            assert master == upstream
 
             with EmptyDir() as tmp:
                 shell(
@@ -40,17 +49,20 @@ def test_worktree_fetch():
                 )
                 remote_commit = git.Repo(f"{tmp}/tmp").commit("master").hexsha
 
-            assert repo.commit("master").hexsha == repo.commit("origin/master").hexsha
-            assert repo.commit("master").hexsha == repo.commit("upstream/master").hexsha
+            (master, origin, upstream) = heads()
+            assert master == origin
+            assert master == upstream
 
             cmd = grm(["wt", "fetch"], cwd=base_dir)
             assert cmd.returncode == 0
 
-            assert repo.commit("master").hexsha == repo.commit("origin/master").hexsha
-            assert repo.commit("master").hexsha == root_commit
-            assert repo.commit("upstream/master").hexsha == remote_commit
+            (master, origin, upstream) = heads()
+            assert master == origin
+            assert master == root_commit
+            assert upstream == remote_commit
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize("rebase", [True, False])
 @pytest.mark.parametrize("ffable", [True, False])
 @pytest.mark.parametrize("has_changes", [True, False])
@@ -88,24 +100,24 @@ def test_worktree_pull(rebase, ffable, has_changes, stash):
                 grm(["wt", "add", "master", "--track", "upstream/master"], cwd=base_dir)
 
                 repo = git.Repo(f"{base_dir}/master")
+                script = ""
                 if not ffable:
-                    shell(
-                        f"""
+                    script += f"""
                         cd {base_dir}/master
                         echo change > mychange
                         git add mychange
                         git commit -m "local-commit-in-master"
                     """
-                    )
 
                 if has_changes:
-                    shell(
-                        f"""
+                    script += f"""
                         cd {base_dir}/master
                         echo change >> root-commit-in-worktree-1
                         echo uncommitedchange > uncommitedchange
                     """
-                    )
+
+                if script:
+                    shell(script)
 
                 args = ["wt", "pull"]
                 if rebase:
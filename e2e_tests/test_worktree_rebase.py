@@ -8,8 +8,18 @@ import pytest
 import git
 
 
-@pytest.mark.parametrize("pull", [True, False])
-@pytest.mark.parametrize("rebase", [True, False])
+def test_worktree_rebase_requires_pull():
+    # grm refuses this before even looking for a repository
+    with EmptyDir() as base_dir:
+        cmd = grm(["wt", "rebase", "--rebase"], cwd=base_dir)
+        assert cmd.returncode != 0
+        assert len(cmd.stdout) == 0
+        assert "no point in using --rebase without --pull" in cmd.stderr.lower()
+
+
+# --rebase without --pull is rejected up front, see
+# test_worktree_rebase_requires_pull()
+@pytest.mark.parametrize("pull,rebase", [(True, True), (True, False), (False, False)])
 @pytest.mark.parametrize("ffable", [True, False])
 @pytest.mark.parametrize("has_changes", [True, False])
 @pytest.mark.parametrize("stash", [True, False])
@@ -18,8 +28,6 @@ def test_worktree_rebase(pull, rebase, ffable, has_changes, stash):
         with open(os.path.join(base_dir, "grm.toml"), "w") as f:
             f.write('persistent_branches = ["mybasebranch"]')
 
-        repo = git.Repo(f"{base_dir}/.git-main-working-tree")
-
         grm(
             ["wt", "add", "mybasebranch", "--track", "origin/mybasebranch"],
             cwd=base_dir,
@@ -61,19 +69,20 @@ def test_worktree_rebase(pull, rebase, ffable, has_changes, stash):
             echo change > mychange-base-remote
             git add mychange-base-remote
             git commit -m "commit-in-base-remote"
-            git push origin HEAD:mybasebranch
+            base_remote=$(git rev-parse HEAD)
 
             git reset --hard myfeatbranch
             echo change > mychange-feat-remote
             git add mychange-feat-remote
             git commit -m "commit-in-feat-remote"
-            git push origin HEAD:myfeatbranch
+
+            git push origin ${{base_remote}}:refs/heads/mybasebranch HEAD:myfeatbranch
         """
         )
 
+        script = ""
         if not ffable:
-            shell(
-                f"""
+            script += f"""
                 cd {base_dir}/mybasebranch
                 echo change > mychange-base-no-ff
                 git add mychange-base-no-ff
@@ -84,15 +93,15 @@ def test_worktree_rebase(pull, rebase, ffable, has_changes, stash):
                 git add mychange-feat-no-ff
                 git commit -m "commit-in-feat-local-no-ff"
             """
-            )
 
         if has_changes:
-            shell(
-                f"""
+            script += f"""
                 cd {base_dir}/myfeatbranch
                 echo uncommitedchange > uncommitedchange
             """
-            )
+
+        if script:
+            shell(script)
 
         grm(["wt", "delete", "--force", "tmp"], cwd=base_dir)
 
@@ -148,10 +157,7 @@ def test_worktree_rebase(pull, rebase, ffable, has_changes, stash):
             args += ["--stash"]
         cmd = grm(args, cwd=base_dir)
 
-        if rebase and not pull:
-            assert cmd.returncode != 0
-            assert len(cmd.stderr) != 0
-        elif has_changes and not stash:
+        if has_changes and not stash:
             assert cmd.returncode != 0
             assert re.match(r".*myfeatbranch.*contains changes.*", cmd.stderr)
         else:
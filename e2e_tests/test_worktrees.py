@@ -650,19 +650,20 @@ def test_worktree_delete_refusal(reason):
         if reason == "new_file":
             shell(f"cd {base_dir}/test && touch changed_file")
         elif reason == "changed_file":
-            shell(
-                f"cd {base_dir}/test && git ls-files | shuf | head | while read f ; do echo $RANDOM > $f ; done"
-            )
+            for file in tracked_files(f"{base_dir}/test"):
+                with open(file, "w") as f:
+                    f.write("changed\n")
         elif reason == "deleted_file":
-            shell(f"cd {base_dir}/test && git ls-files | shuf | head | xargs rm -rf")
+            for file in tracked_files(f"{base_dir}/test"):
+                os.remove(file)
         elif reason == "new_commit":
             shell(
                 f'cd {base_dir}/test && touch changed_file && git add changed_file && git commit -m "commitmsg"'
             )
         elif reason == "tracking_branch_mismatch":
-            shell(
-                f"cd {base_dir}/test && git push origin test && git reset --hard origin/test^"
-            )
+            # `wt add --track` already made sure that origin/test exists and points
+            # to the same commit as the local branch, so there is no need to push
+            shell(f"cd {base_dir}/test && git reset --hard origin/test^")
 
         else:
             raise NotImplementedError()